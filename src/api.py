@@ -6,14 +6,19 @@ electricity rates, sourced from the official residential_bills.pdf which
 contains MERALCO's pre-computed per-kWh rates at standard consumption levels.
 """
 
+import hashlib
+import json
 import logging
+import os
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import TypedDict
 
-from flask import Flask, jsonify
+from dateutil.relativedelta import relativedelta
+from flask import Flask, Response, jsonify, request
 from flask.json.provider import DefaultJSONProvider
 from flask.typing import ResponseReturnValue
+from werkzeug.http import generate_etag
 
 from .parser import MeralcoRatesMeta, MeralcoRatesResult, RateEntry, get_meralco_rates
 
@@ -29,20 +34,47 @@ assert isinstance(app.json, DefaultJSONProvider)
 app.json.sort_keys = False
 
 FALLBACK_RETRY_SECONDS = 3600
+# How long current-month data is served before re-checking the PDF, so a
+# mid-month revision by MERALCO is picked up. Unchanged PDFs cost a 304.
+REVALIDATE_SECONDS = 6 * 3600
+
+# Lets Home Assistant, browsers and proxies reuse a /rates response. Capped
+# at the time left until the cache expires, so a client never holds data
+# past the point where we would refetch it.
+CLIENT_MAX_AGE_SECONDS = FALLBACK_RETRY_SECONDS
+
+# Survives process restarts so a redeploy doesn't force a fresh PDF parse.
+RATES_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), ".cache", "rates.json"
+)
+# Bump when the saved shape changes, so files from older releases are ignored.
+RATES_CACHE_VERSION = 1
 
 
 class CacheState(TypedDict):
     data: MeralcoRatesResult | None
-    month: tuple[int, int] | None
-    is_fallback: bool
-    timestamp: datetime | None
+    # Precomputed when `data` is stored, so a cache hit is one comparison.
+    expires_at: datetime | None
+    signature: str | None
+    # Rendered success bodies and their ETags, keyed by kWh level (None for
+    # the full /rates list), paired with the result they were rendered from.
+    # Replaced as one value whenever `data` changes, so a reader never sees
+    # one result's bodies filed under another.
+    rendered: tuple[MeralcoRatesResult | None, dict[int | None, tuple[bytes, str]]]
+    # Bumped after every upstream attempt, with `last_result` holding what it
+    # served. Requests that queued on _fetch_lock behind an attempt reuse its
+    # result, so a failing upstream is hit once per burst, not once per request.
+    attempt: int
+    last_result: MeralcoRatesResult | None
 
 
 _cache: CacheState = {
     "data": None,
-    "month": None,
-    "is_fallback": False,
-    "timestamp": None,
+    "expires_at": None,
+    "signature": None,
+    "rendered": (None, {}),
+    "attempt": 0,
+    "last_result": None,
 }
 _fetch_lock = threading.Lock()
 
@@ -53,21 +85,126 @@ TYPICAL_KWH = 200
 
 
 def _is_cache_valid() -> bool:
-    if not _cache["data"] or not _cache["month"]:
-        return False
+    expires_at = _cache["expires_at"]
+    return (
+        bool(_cache["data"]) and expires_at is not None and datetime.now() < expires_at
+    )
 
-    now = datetime.now()
 
-    if _cache["month"] == (now.year, now.month) and not _cache["is_fallback"]:
-        return True
+def _client_max_age() -> int:
+    """Seconds a client may reuse a response built from the cached data."""
+    expires_at = _cache["expires_at"]
+    if expires_at is None:
+        return 0
+    remaining = int((expires_at - datetime.now()).total_seconds())
+    return max(0, min(CLIENT_MAX_AGE_SECONDS, remaining))
+
+
+def _cache_expiry(now: datetime, is_fallback: bool) -> datetime:
+    """When data stored at `now` stops being served without a refetch.
+
+    Fallback data is retried after FALLBACK_RETRY_SECONDS. Current-month
+    data is revalidated after REVALIDATE_SECONDS, or at the start of next
+    month if that comes first.
+    """
+    if is_fallback:
+        return now + timedelta(seconds=FALLBACK_RETRY_SECONDS)
+    next_month = now + relativedelta(
+        months=1, day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    return min(next_month, now + timedelta(seconds=REVALIDATE_SECONDS))
+
+
+def _rates_signature(result: MeralcoRatesResult) -> str:
+    """Hash everything about a result except when it was fetched."""
+    payload = {
+        "warning": result.get("warning"),
+        "date": result.get("date"),
+        "data": result.get("data"),
+        "source": result["meta"]["source"],
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _set_cache(
+    data: MeralcoRatesResult,
+    expires_at: datetime,
+    signature: str,
+) -> None:
+    if data is not _cache["data"]:
+        _cache["rendered"] = (data, {})
+    _cache["data"] = data
+    _cache["expires_at"] = expires_at
+    _cache["signature"] = signature
+
+
+def _save_cache_file() -> None:
+    """Write the in-memory cache to RATES_CACHE_PATH (best effort)."""
+    expires_at = _cache["expires_at"]
+    saved = {
+        "version": RATES_CACHE_VERSION,
+        "data": _cache["data"],
+        "expires_at": expires_at.isoformat() if expires_at else None,
+        "signature": _cache["signature"],
+    }
+    tmp_path = f"{RATES_CACHE_PATH}.tmp"
+    try:
+        os.makedirs(os.path.dirname(RATES_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(saved, f)
+        os.replace(tmp_path, RATES_CACHE_PATH)
+    except OSError as exc:
+        logger.warning("Failed to write rates cache to %s: %s", RATES_CACHE_PATH, exc)
+
+
+def _is_saved_result(data: object) -> bool:
+    """Whether `data` has the shape of a successful MeralcoRatesResult."""
+    if not isinstance(data, dict):
+        return False
+    if not data.keys() >= MeralcoRatesResult.__required_keys__:
+        return False
+    entries, meta = data["data"], data["meta"]
+    return (
+        data["success"] is True
+        and isinstance(entries, list)
+        and all(isinstance(e, dict) and isinstance(e.get("kwh"), int) for e in entries)
+        and isinstance(meta, dict)
+        and "source" in meta
+    )
+
 
-    timestamp = _cache["timestamp"]
-    if _cache["is_fallback"] and timestamp is not None:
-        elapsed = (now - timestamp).total_seconds()
-        if elapsed < FALLBACK_RETRY_SECONDS:
-            return True
+def _load_cache_file() -> None:
+    """Restore the cache written by a previous process, if there is one.
+
+    The file is checked before anything in it is served. Its expiry is capped
+    at what a fresh fetch right now would get, so a bad timestamp can't pin
+    old rates in place.
+    """
+    try:
+        with open(RATES_CACHE_PATH) as f:
+            saved = json.load(f)
+        if saved["version"] != RATES_CACHE_VERSION:
+            raise ValueError(f"cache version {saved['version']!r}")
+        data = saved["data"]
+        if not _is_saved_result(data):
+            raise ValueError("cached data is not a successful rates result")
+        signature = saved["signature"]
+        if not isinstance(signature, str):
+            raise TypeError("cached signature is not a string")
+        expires_at = datetime.fromisoformat(saved["expires_at"])
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning(
+            "Ignoring unreadable rates cache at %s: %s", RATES_CACHE_PATH, exc
+        )
+        return
 
-    return False
+    now = datetime.now()
+    expires_at = min(expires_at, _cache_expiry(now, bool(data["warning"])))
+    logger.info("Restored cached rates from %s", RATES_CACHE_PATH)
+    _set_cache(data, expires_at, signature)
 
 
 def _fetch_and_cache() -> MeralcoRatesResult:
@@ -77,44 +214,66 @@ def _fetch_and_cache() -> MeralcoRatesResult:
         assert cached is not None
         return cached
 
+    attempt = _cache["attempt"]
     with _fetch_lock:
+        if _cache["data"] is None:
+            _load_cache_file()
+
         if _is_cache_valid():
             cached = _cache["data"]
             assert cached is not None
             return cached
 
+        last_result = _cache["last_result"]
+        if _cache["attempt"] != attempt and last_result is not None:
+            # Another request fetched while this one waited for the lock.
+            return last_result
+
         logger.info("Cache expired or empty, fetching fresh data...")
-        now = datetime.now()
-        result = get_meralco_rates()
-
-        if result.get("success"):
-            _cache["data"] = result
-            _cache["month"] = (now.year, now.month)
-            _cache["is_fallback"] = bool(result.get("warning"))
-            _cache["timestamp"] = now
-            return result
-
-        logger.warning("Failed to fetch rates: %s", result.get("error"))
-
-        cached_data = _cache["data"]
-        if cached_data and cached_data.get("success"):
-            stale: MeralcoRatesResult = {
-                "success": cached_data["success"],
-                "error": cached_data["error"],
-                "warning": cached_data["warning"]
-                or "Current rates temporarily unavailable. Using cached values.",
-                "date": cached_data["date"],
-                "data": cached_data["data"],
-                "meta": cached_data["meta"],
-            }
-            _cache["data"] = stale
-            _cache["month"] = (now.year, now.month)
-            _cache["is_fallback"] = True
-            _cache["timestamp"] = now
-            return stale
+        result = _store_fetch_result(get_meralco_rates(), datetime.now())
+        _cache["last_result"] = result
+        _cache["attempt"] += 1
+        return result
+
 
+def _store_fetch_result(
+    result: MeralcoRatesResult, now: datetime
+) -> MeralcoRatesResult:
+    """Cache a fresh fetch result and return what should be served for it.
+
+    Called with _fetch_lock held. On failure, previously cached rates are
+    served as stale data when there are any.
+    """
+    if result.get("success"):
+        signature = _rates_signature(result)
+        if _cache["data"] is not None and signature == _cache["signature"]:
+            # Same rates as before: keep serving the cached result as-is.
+            logger.info("Rates unchanged since last fetch")
+            result = _cache["data"]
+        is_fallback = bool(result.get("warning"))
+        _set_cache(result, _cache_expiry(now, is_fallback), signature)
+        _save_cache_file()
         return result
 
+    logger.warning("Failed to fetch rates: %s", result.get("error"))
+
+    cached_data = _cache["data"]
+    if cached_data and cached_data.get("success"):
+        stale: MeralcoRatesResult = {
+            "success": cached_data["success"],
+            "error": cached_data["error"],
+            "warning": cached_data["warning"]
+            or "Current rates temporarily unavailable. Using cached values.",
+            "date": cached_data["date"],
+            "data": cached_data["data"],
+            "meta": cached_data["meta"],
+        }
+        _set_cache(stale, _cache_expiry(now, True), _rates_signature(stale))
+        _save_cache_file()
+        return stale
+
+    return result
+
 
 def _find_entry(data: list[RateEntry], kwh: int) -> RateEntry | None:
     for entry in data:
@@ -209,12 +368,41 @@ def _build_response(
     return resp
 
 
+def _cacheable_response(
+    result: MeralcoRatesResult,
+    kwh: int | None,
+    data: list[RateEntry] | RateEntry | None,
+) -> Response:
+    """Serve a success payload with ETag/Cache-Control, honouring If-None-Match.
+
+    While `result` is the cached one, the JSON body and its ETag are rendered
+    once and reused, so cache hits skip serialisation and hashing.
+    """
+    owner, bodies = _cache["rendered"]
+    is_cached = result is owner
+    rendered = bodies.get(kwh) if is_cached else None
+    if rendered is None:
+        body = jsonify(_build_response(result, data)).get_data()
+        rendered = (body, generate_etag(body))
+        if is_cached:
+            # `bodies` belongs to `result` even if the cache has moved on.
+            bodies[kwh] = rendered
+
+    body, etag = rendered
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = _client_max_age()
+    response.make_conditional(request)
+    return response
+
+
 @app.route("/rates")
 def rates() -> ResponseReturnValue:
     result = _fetch_and_cache()
     if not result.get("success"):
         return jsonify(_clean_response(result))
-    return jsonify(_build_response(result, result.get("data")))
+    return _cacheable_response(result, None, result.get("data"))
 
 
 @app.route("/rates/<kwh_slug>")
@@ -255,7 +443,7 @@ def rates_by_kwh(kwh_slug: str) -> ResponseReturnValue:
             404,
         )
 
-    return jsonify(_build_response(result, entry))
+    return _cacheable_response(result, kwh, entry)
 
 
 def main() -> None:
@@ -8,12 +8,16 @@ pre-computed per-kWh rates at 15 consumption levels (50, 70, 100, 200, ...,
 """
 
 import calendar
+import functools
 import io
 import logging
 import os
 import re
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import formatdate
 from typing import Literal, TypedDict
 
 import pdfplumber
@@ -66,9 +70,13 @@ class _ParsedMonth(TypedDict):
 
 def get_pdf_url(target_date: datetime) -> str:
     """Generate the S3 URL for a month's residential bills PDF."""
-    month = f"{target_date.month:02d}"
-    year = target_date.year
-    return f"{PDF_BASE_URL}/{year}-{month}/{month}-{year}_residential_bills.pdf"
+    return _pdf_url_for(target_date.year, target_date.month)
+
+
+@functools.lru_cache(maxsize=32)
+def _pdf_url_for(year: int, month: int) -> str:
+    mm = f"{month:02d}"
+    return f"{PDF_BASE_URL}/{year}-{mm}/{mm}-{year}_residential_bills.pdf"
 
 
 def parse_residential_bills(rows: list[PdfRow]) -> list[ParsedRate]:
@@ -148,26 +156,49 @@ def _get_cache_path(url: str) -> str:
     return os.path.join(PDF_CACHE_DIR, filename)
 
 
-def download_pdf(url: str) -> bytes | None:
-    """Download PDF from URL with disk caching. Returns bytes or None on failure."""
+def _read_cached_pdf(cache_path: str) -> bytes:
+    with open(cache_path, "rb") as f:
+        return f.read()
+
+
+def download_pdf(url: str, revalidate: bool = False) -> bytes | None:
+    """Download PDF from URL with disk caching. Returns bytes or None on failure.
+
+    With revalidate=True a cached copy is checked with If-Modified-Since
+    (against the file's mtime, i.e. when we downloaded it) and only
+    re-downloaded if MERALCO has replaced it since. If the check fails for
+    any reason the cached copy is returned.
+    """
     cache_path = _get_cache_path(url)
+    is_cached = os.path.exists(cache_path)
 
-    if os.path.exists(cache_path):
+    if is_cached and not revalidate:
         logger.info("Using cached PDF: %s", cache_path)
-        with open(cache_path, "rb") as f:
-            return f.read()
+        return _read_cached_pdf(cache_path)
+
+    request = urllib.request.Request(url)
+    if is_cached:
+        request.add_header(
+            "If-Modified-Since", formatdate(os.path.getmtime(cache_path), usegmt=True)
+        )
 
     try:
         logger.info("Downloading PDF: %s", url)
         os.makedirs(PDF_CACHE_DIR, exist_ok=True)
-        with urllib.request.urlopen(url, timeout=30) as response:
+        with urllib.request.urlopen(request, timeout=30) as response:
             pdf_bytes: bytes = response.read()
         with open(cache_path, "wb") as f:
             f.write(pdf_bytes)
         return pdf_bytes
     except Exception as e:
-        logger.error("Failed to download PDF from %s: %s", url, e)
-        return None
+        if not is_cached:
+            logger.error("Failed to download PDF from %s: %s", url, e)
+            return None
+        if isinstance(e, urllib.error.HTTPError) and e.code == 304:
+            logger.info("Cached PDF is still current: %s", cache_path)
+        else:
+            logger.warning("Could not revalidate %s (%s); using cached PDF", url, e)
+        return _read_cached_pdf(cache_path)
 
 
 def _cleanup_old_pdfs(keep_urls: list[str]) -> None:
@@ -192,6 +223,11 @@ MONTH_REGEX = re.compile(
 )
 
 
+# The billing month is in the page header (within the first ~50 characters
+# of extract_text() on every fixture); don't scan the whole rate table for it.
+PAGE_TEXT_SCAN_LIMIT = 2048
+
+
 def _format_billing_date(match: re.Match[str]) -> str:
     """Convert a MONTH_REGEX match to a MM/YYYY string."""
     month = _MONTH_INDEX[match.group(1).lower()]
@@ -205,22 +241,23 @@ def _extract_billing_date(rows: list[PdfRow]) -> str | None:
     The residential_bills PDF header contains the month name and year,
     e.g. 'RESIDENTIAL BILLS AT TYPICAL CONSUMPTION LEVELS' / 'April 2026'.
     """
-    for row in rows:
-        if not row:
-            continue
-        for cell in row:
-            if not cell:
-                continue
-            match = MONTH_REGEX.search(str(cell))
-            if match:
-                return _format_billing_date(match)
-    return None
+    # One search over all cells instead of one per cell. NUL is not matched
+    # by \s, so a match can't straddle two cells.
+    text = "\0".join(str(cell) for row in rows if row for cell in row if cell)
+    match = MONTH_REGEX.search(text)
+    return _format_billing_date(match) if match else None
 
 
+# Keyed on the PDF bytes: every refresh re-reads the previous month's
+# unchanged PDF (and, in fallback mode, two of them every retry), and a
+# pdfplumber parse costs about a second. Callers must not mutate the result.
+@functools.lru_cache(maxsize=4)
 def _parse_single_month(pdf_bytes: bytes) -> _ParsedMonth | None:
     """Parse a single month's residential_bills PDF, returning entries and billing date."""
     try:
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        # The rate table and header live on the first page; don't build
+        # page objects for anything MERALCO appends after it.
+        with pdfplumber.open(io.BytesIO(pdf_bytes), pages=[1]) as pdf:
             if not pdf.pages:
                 return None
             tables = pdf.pages[0].extract_tables()
@@ -234,7 +271,7 @@ def _parse_single_month(pdf_bytes: bytes) -> _ParsedMonth | None:
             if not billing_date:
                 # Fallback: try the raw page text
                 page_text = pdf.pages[0].extract_text() or ""
-                match = MONTH_REGEX.search(page_text)
+                match = MONTH_REGEX.search(page_text, 0, PAGE_TEXT_SCAN_LIMIT)
                 if match:
                     billing_date = _format_billing_date(match)
             return {"entries": entries, "billing_date": billing_date}
@@ -243,6 +280,12 @@ def _parse_single_month(pdf_bytes: bytes) -> _ParsedMonth | None:
         return None
 
 
+def _fetch_month(url: str, revalidate: bool = False) -> _ParsedMonth | None:
+    """Download and parse one month's PDF. Returns None if either step fails."""
+    pdf_bytes = download_pdf(url, revalidate)
+    return _parse_single_month(pdf_bytes) if pdf_bytes else None
+
+
 def get_meralco_rates() -> MeralcoRatesResult:
     """Main entry point: fetch current and previous month PDFs, compute rate changes."""
     now = datetime.now()
@@ -251,20 +294,25 @@ def get_meralco_rates() -> MeralcoRatesResult:
         "source": None,
     }
 
+    prev = now - relativedelta(months=1)
     current_url = get_pdf_url(now)
-    current_bytes = download_pdf(current_url)
-    current_parsed = _parse_single_month(current_bytes) if current_bytes else None
+    prev_url = get_pdf_url(prev)
+
+    # The previous month is needed either way (diff base, or fallback when
+    # the current month isn't published yet), so fetch both at once. Each
+    # worker parses its own PDF, overlapping one parse with the other download.
+    # Only the current month is revalidated: it's the one MERALCO may revise
+    # mid-month, and an unchanged PDF costs a 304 and a parse-cache hit.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        current_parsed, prev_parsed = executor.map(
+            _fetch_month, [current_url, prev_url], [True, False]
+        )
 
     warning: str | None = None
 
     if not current_parsed:
         logger.warning("Current month failed, trying previous month...")
-        prev = now - relativedelta(months=1)
-        current_url = get_pdf_url(prev)
-        current_bytes = download_pdf(current_url)
-        current_parsed = _parse_single_month(current_bytes) if current_bytes else None
-
-        if not current_parsed:
+        if not prev_parsed:
             return {
                 "success": False,
                 "error": "Could not find rate information for current or previous month",
@@ -278,13 +326,10 @@ def get_meralco_rates() -> MeralcoRatesResult:
             f"{now.strftime('%B %Y')} rates not yet available. "
             f"Using {prev.strftime('%B %Y')} rates instead."
         )
-        prev_for_diff = prev - relativedelta(months=1)
-    else:
-        prev_for_diff = now - relativedelta(months=1)
+        current_url, current_parsed = prev_url, prev_parsed
+        prev_url = get_pdf_url(prev - relativedelta(months=1))
+        prev_parsed = _fetch_month(prev_url)
 
-    prev_url = get_pdf_url(prev_for_diff)
-    prev_bytes = download_pdf(prev_url)
-    prev_parsed = _parse_single_month(prev_bytes) if prev_bytes else None
     prev_entries = prev_parsed["entries"] if prev_parsed else None
 
     entries_with_changes = compute_rate_changes(current_parsed["entries"], prev_entries)
@@ -15,4 +15,6 @@ class PDF(AbstractContextManager["PDF"]):
         traceback: object,
     ) -> None: ...
 
-def open(path_or_fp: str | IO[bytes]) -> PDF: ...
+def open(
+    path_or_fp: str | IO[bytes], pages: list[int] | tuple[int, ...] | None = None
+) -> PDF: ...
@@ -0,0 +1,28 @@
+"""Shared test fixtures."""
+
+from collections.abc import Callable
+from datetime import datetime
+from types import ModuleType
+
+import pytest
+
+from tests.helpers import FrozenClock
+
+
+@pytest.fixture
+def freeze_clock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[[ModuleType, datetime], FrozenClock]:
+    """Freeze a module's clock by swapping its `datetime` name for a FrozenClock.
+
+    A module-global swap rather than mock.patch, so no MagicMock is built;
+    monkeypatch restores the real `datetime` at teardown. Move the clock by
+    setting `.current` on the returned FrozenClock.
+    """
+
+    def freeze(module: ModuleType, current: datetime) -> FrozenClock:
+        clock = FrozenClock(current)
+        monkeypatch.setattr(module, "datetime", clock)
+        return clock
+
+    return freeze
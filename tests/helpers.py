@@ -0,0 +1,15 @@
+"""Helpers shared by the test modules."""
+
+from datetime import datetime, tzinfo
+
+
+class FrozenClock:
+    """Stands in for a module's `datetime`; now() returns `current`."""
+
+    fromisoformat = staticmethod(datetime.fromisoformat)
+
+    def __init__(self, current: datetime) -> None:
+        self.current = current
+
+    def now(self, tz: tzinfo | None = None) -> datetime:
+        return self.current
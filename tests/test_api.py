@@ -1,18 +1,48 @@
 """Tests for the MERALCO API."""
 
 import json
-from collections.abc import Iterator
+import threading
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from types import ModuleType
+from typing import NamedTuple
+from unittest.mock import ANY, patch
 
 import pytest
+from flask import Response, jsonify
 from flask.testing import FlaskClient
 
-from src.api import FALLBACK_RETRY_SECONDS, _cache, app
+import src.api
+from src.api import (
+    FALLBACK_RETRY_SECONDS,
+    RATES_CACHE_VERSION,
+    REVALIDATE_SECONDS,
+    CacheState,
+    _cache,
+    _cache_expiry,
+    _fetch_and_cache,
+    _is_cache_valid,
+    _set_cache,
+    app,
+)
 from src.parser import MeralcoRatesResult
+from tests.helpers import FrozenClock
+
+app.config["TESTING"] = True
 
 FIXED_NOW = datetime(2026, 6, 15, 12, 0, 0)
 
+EMPTY_CACHE: CacheState = {
+    "data": None,
+    "expires_at": None,
+    "signature": None,
+    "rendered": (None, {}),
+    "attempt": 0,
+    "last_result": None,
+}
+
 MOCK_RATES: MeralcoRatesResult = {
     "success": True,
     "error": None,
@@ -131,31 +161,156 @@ MOCK_RATES: MeralcoRatesResult = {
     },
 }
 
+MOCK_FALLBACK_RATES: MeralcoRatesResult = {
+    **MOCK_RATES,
+    "warning": "Using previous month",
+}
+
+MOCK_FAILED_RATES: MeralcoRatesResult = {
+    "success": False,
+    "error": "Could not find rate information for current or previous month",
+    "warning": None,
+    "date": None,
+    "data": None,
+    "meta": {"timestamp": "2026-06-09T10:00:00", "source": None},
+}
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(
+    freeze_clock: Callable[[ModuleType, datetime], FrozenClock],
+) -> FrozenClock:
+    """Freeze src.api's clock at FIXED_NOW; tests move it via `.current`."""
+    return freeze_clock(src.api, FIXED_NOW)
+
+
+class _FakeGetRates:
+    """Counting stand-in for src.api.get_meralco_rates."""
+
+    def __init__(self, return_value: MeralcoRatesResult) -> None:
+        self.reset(return_value)
+
+    def reset(self, return_value: MeralcoRatesResult) -> None:
+        self.return_value = return_value
+        self.call_count = 0
+
+    def __call__(self) -> MeralcoRatesResult:
+        self.call_count += 1
+        return self.return_value
+
+
+@pytest.fixture(scope="module")
+def rates_stub() -> _FakeGetRates:
+    """The module's single _FakeGetRates; get_rates resets it for each test."""
+    return _FakeGetRates(MOCK_RATES)
+
 
 @pytest.fixture
-def client() -> Iterator[FlaskClient]:
-    app.config["TESTING"] = True
-    with app.test_client() as c:
-        yield c
+def get_rates(
+    rates_stub: _FakeGetRates, monkeypatch: pytest.MonkeyPatch
+) -> _FakeGetRates:
+    """Install rates_stub returning MOCK_RATES; tests may swap return_value."""
+    rates_stub.reset(MOCK_RATES)
+    monkeypatch.setattr("src.api.get_meralco_rates", rates_stub)
+    return rates_stub
+
+
+class _RatesScenario(NamedTuple):
+    """A canned upstream result and what /rates should make of it."""
+
+    result: MeralcoRatesResult
+    body: dict[str, object]
+    # Upstream fetches made by two back-to-back /rates requests.
+    fetches: int
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            _RatesScenario(
+                MOCK_RATES,
+                {
+                    "success": True,
+                    "date": "03/2026",
+                    "data": MOCK_RATES["data"],
+                    "meta": {
+                        "timestamp": "2026-06-09T10:00:00",
+                        "source": "https://example.com/test.pdf",
+                    },
+                },
+                1,
+            ),
+            id="current-month",
+        ),
+        pytest.param(
+            _RatesScenario(
+                MOCK_FALLBACK_RATES,
+                {
+                    "success": True,
+                    "warning": "Using previous month",
+                    "date": "03/2026",
+                    "data": MOCK_RATES["data"],
+                    "meta": {
+                        "timestamp": "2026-06-09T10:00:00",
+                        "source": "https://example.com/test.pdf",
+                    },
+                },
+                1,
+            ),
+            id="fallback",
+        ),
+        pytest.param(
+            _RatesScenario(
+                MOCK_FAILED_RATES,
+                {
+                    "success": False,
+                    "error": (
+                        "Could not find rate information for current or previous month"
+                    ),
+                    "date": None,
+                    "data": None,
+                    "meta": {"timestamp": "2026-06-09T10:00:00", "source": None},
+                },
+                2,
+            ),
+            id="failed",
+        ),
+    ],
+)
+def fake_rates(
+    request: pytest.FixtureRequest, get_rates: _FakeGetRates
+) -> _RatesScenario:
+    """Point get_rates at each canned scenario's upstream result in turn."""
+    scenario: _RatesScenario = request.param
+    get_rates.return_value = scenario.result
+    return scenario
+
+
+@pytest.fixture(scope="session")
+def client() -> FlaskClient:
+    # One client for the whole run: no test relies on cookies or a preserved
+    # request context, and per-test isolation comes from reset_cache.
+    return app.test_client()
 
 
 @pytest.fixture(autouse=True)
-def reset_cache() -> Iterator[None]:
-    _cache["data"] = None
-    _cache["month"] = None
-    _cache["is_fallback"] = False
-    _cache["timestamp"] = None
-    yield
-    _cache["data"] = None
-    _cache["month"] = None
-    _cache["is_fallback"] = False
-    _cache["timestamp"] = None
+def rates_cache_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "rates.json"
+    monkeypatch.setattr("src.api.RATES_CACHE_PATH", str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def reset_cache() -> None:
+    # Reset on the way in only: every test starts from here, and nothing
+    # reads _cache during teardown.
+    _cache.update(EMPTY_CACHE)
 
 
 def test_index(client: FlaskClient) -> None:
     response = client.get("/")
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data["service"] == "MERALCO API"
     assert "/rates" in data["endpoints"]
     assert "/rates/typical" in data["endpoints"]
@@ -165,233 +320,379 @@ def test_index(client: FlaskClient) -> None:
 def test_health(client: FlaskClient) -> None:
     response = client.get("/health")
     assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data["status"] == "ok"
+    assert response.data == b'{"status":"ok"}\n'
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_returns_all_levels(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_rates_serves_fetch_result(
+    fake_rates: _RatesScenario, client: FlaskClient
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
-
     response = client.get("/rates")
     assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data["success"] is True
-    assert len(data["data"]) == 15
-    assert data["date"] == "03/2026"
-    assert "error" not in data
-    assert "warning" not in data
+    assert response.get_json() == fake_rates.body
+
+
+@pytest.mark.usefixtures("get_rates")
+@pytest.mark.parametrize(
+    ("slug", "kwh"),
+    [("typical", 200), ("200", 200), ("500", 500)],
+    ids=["typical-is-200", "by-kwh", "over-400"],
+)
+def test_rates_by_kwh(client: FlaskClient, slug: str, kwh: int) -> None:
+    entry = next(e for e in MOCK_RATES["data"] or [] if e["kwh"] == kwh)
+    response = client.get(f"/rates/{slug}")
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "success": True,
+        "date": "03/2026",
+        "data": entry,
+        "meta": MOCK_RATES["meta"],
+    }
+
 
+@pytest.mark.usefixtures("get_rates")
+@pytest.mark.parametrize("slug", ["999", "101-200"], ids=["integer", "nonnumeric"])
+def test_rates_invalid_kwh(client: FlaskClient, slug: str) -> None:
+    response = client.get(f"/rates/{slug}")
+    assert response.status_code == 404
+    data = response.get_json()
+    assert data["success"] is False
+    assert "Consumption level not available" in data["error"]
+    assert data["data"] is None
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_typical_is_200(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+
+@pytest.mark.usefixtures("get_rates")
+def test_rates_404_shape_matches_clean_response(client: FlaskClient) -> None:
+    """404 payload must carry the same fields _clean_response produces."""
+    response = client.get("/rates/999")
+    assert response.status_code == 404
+    assert response.get_json() == {
+        "success": False,
+        "error": ANY,
+        "date": "03/2026",
+        "data": None,
+        "meta": MOCK_RATES["meta"],
+    }
+
+
+@pytest.mark.parametrize(
+    ("stored_at", "is_fallback", "checked_at", "expected"),
+    [
+        (None, False, FIXED_NOW, False),
+        (FIXED_NOW, False, FIXED_NOW + timedelta(hours=1), True),
+        (
+            FIXED_NOW,
+            False,
+            FIXED_NOW + timedelta(seconds=REVALIDATE_SECONDS + 1),
+            False,
+        ),
+        (datetime(2026, 6, 30, 23, 0, 0), False, datetime(2026, 7, 1, 0, 0, 1), False),
+        (FIXED_NOW, True, FIXED_NOW + timedelta(minutes=30), True),
+        (
+            FIXED_NOW,
+            True,
+            FIXED_NOW + timedelta(seconds=FALLBACK_RETRY_SECONDS + 1),
+            False,
+        ),
+    ],
+    ids=[
+        "empty",
+        "current-month",
+        "revalidate-due",
+        "next-month",
+        "fallback",
+        "fallback-retry-due",
+    ],
+)
+def test_is_cache_valid(
+    stored_at: datetime | None,
+    is_fallback: bool,
+    checked_at: datetime,
+    expected: bool,
+    frozen_now: FrozenClock,
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    if stored_at is not None:
+        _cache["data"] = MOCK_RATES
+        _cache["expires_at"] = _cache_expiry(stored_at, is_fallback)
+    frozen_now.current = checked_at
+    assert _is_cache_valid() is expected
 
-    response = client.get("/rates/typical")
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data["success"] is True
-    assert data["data"]["kwh"] == 200
-    assert data["data"]["rate"] == 13.8161
-    assert "error" not in data
-    assert "warning" not in data
+
+def test_rates_caches_only_successful_fetches(
+    fake_rates: _RatesScenario, get_rates: _FakeGetRates, client: FlaskClient
+) -> None:
+    client.get("/rates")
+    client.get("/rates")
+    assert get_rates.call_count == fake_rates.fetches
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_by_kwh(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_rates_fallback_retries_after_interval(
+    get_rates: _FakeGetRates, frozen_now: FrozenClock, client: FlaskClient
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    get_rates.return_value = MOCK_FALLBACK_RATES
+
+    client.get("/rates")
+    assert get_rates.call_count == 1
+
+    frozen_now.current = FIXED_NOW + timedelta(seconds=FALLBACK_RETRY_SECONDS + 1)
+    client.get("/rates")
+    assert get_rates.call_count == 2
+
+
+@pytest.mark.usefixtures("get_rates")
+def test_rates_sends_cache_headers_and_honours_etag(client: FlaskClient) -> None:
+    for path in ("/rates", "/rates/typical"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "public" in response.headers["Cache-Control"]
+        assert "max-age=3600" in response.headers["Cache-Control"]
+
+        revalidated = client.get(path, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b""
 
-    response = client.get("/rates/200")
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data["data"]["kwh"] == 200
-    assert data["data"]["rate"] == 13.8161
 
+@pytest.mark.usefixtures("get_rates")
+def test_rates_max_age_never_outlives_cache(
+    frozen_now: FrozenClock, client: FlaskClient
+) -> None:
+    client.get("/rates")
+
+    # Ten minutes before the server revalidates, clients get ten minutes.
+    frozen_now.current = FIXED_NOW + timedelta(seconds=REVALIDATE_SECONDS - 600)
+    response = client.get("/rates")
+    assert response.cache_control.max_age == 600
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_over_400(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+
+@pytest.mark.usefixtures("get_rates")
+def test_rates_reuses_rendered_body_on_cache_hit(client: FlaskClient) -> None:
+    first = client.get("/rates")
+    with patch("src.api.jsonify", wraps=jsonify) as mock_jsonify:
+        second = client.get("/rates")
+    assert mock_jsonify.call_count == 0
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.mimetype == "application/json"
+
+
+@pytest.mark.usefixtures("get_rates")
+def test_rates_rendered_body_follows_cache_swap_mid_render(
+    client: FlaskClient,
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    revised: MeralcoRatesResult = {**MOCK_RATES, "date": "06/2026"}
 
-    response = client.get("/rates/500")
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert data["data"]["kwh"] == 500
-    assert data["data"]["rate"] == 14.9969
+    def swap_then_render(payload: object) -> Response:
+        # Another thread stores revised rates while this request renders.
+        _set_cache(revised, FIXED_NOW + timedelta(hours=1), "revised")
+        return jsonify(payload)
 
+    with patch("src.api.jsonify", side_effect=swap_then_render):
+        stale = client.get("/rates")
+    assert stale.get_json()["date"] == "03/2026"
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_invalid_kwh_integer(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+    response = client.get("/rates")
+    assert response.get_json()["date"] == "06/2026"
+    assert response.headers["ETag"] != stale.headers["ETag"]
+
+
+def test_rates_failure_is_not_cacheable(
+    get_rates: _FakeGetRates, client: FlaskClient
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    get_rates.return_value = MOCK_FAILED_RATES
 
-    response = client.get("/rates/999")
-    assert response.status_code == 404
-    data = json.loads(response.data)
-    assert data["success"] is False
-    assert "Consumption level not available" in data["error"]
-    assert data["data"] is None
+    response = client.get("/rates")
+    assert "ETag" not in response.headers
+    assert "Cache-Control" not in response.headers
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_invalid_kwh_nonnumeric(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_rates_cache_survives_restart(
+    get_rates: _FakeGetRates,
+    client: FlaskClient,
+    rates_cache_path: Path,
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    client.get("/rates")
+    assert rates_cache_path.exists()
 
-    response = client.get("/rates/101-200")
-    assert response.status_code == 404
-    data = json.loads(response.data)
-    assert data["success"] is False
+    # Simulate a fresh process: memory is empty, the file is not.
+    _cache.update(EMPTY_CACHE)
 
+    response = client.get("/rates")
+    assert get_rates.call_count == 1
+    data = response.get_json()
+    assert data["success"] is True
+    assert len(data["data"]) == 15
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_404_shape_matches_clean_response(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+
+def test_unreadable_cache_file_is_ignored(
+    get_rates: _FakeGetRates, client: FlaskClient, rates_cache_path: Path
 ) -> None:
-    """404 payload must carry the same fields _clean_response produces."""
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    rates_cache_path.write_text("{not json")
+    response = client.get("/rates")
+    assert get_rates.call_count == 1
+    assert response.status_code == 200
 
-    response = client.get("/rates/999")
-    assert response.status_code == 404
-    data = json.loads(response.data)
-    assert set(data.keys()) == {"success", "error", "date", "data", "meta"}
-    assert data["data"] is None
-    assert data["date"] == "03/2026"
-    assert data["meta"]["source"] == "https://example.com/test.pdf"
+
+def _saved_cache(**overrides: object) -> str:
+    """A rates.json body as _save_cache_file writes it, with fields overridden."""
+    saved = {
+        "version": RATES_CACHE_VERSION,
+        "data": MOCK_RATES,
+        "expires_at": (FIXED_NOW + timedelta(hours=1)).isoformat(),
+        "signature": "saved",
+        **overrides,
+    }
+    return json.dumps(saved)
+
+
+@pytest.mark.parametrize(
+    "saved",
+    [
+        _saved_cache(data="oops"),
+        _saved_cache(data={"success": True}),
+        _saved_cache(data=MOCK_FAILED_RATES),
+        _saved_cache(data={**MOCK_RATES, "data": {"kwh": 200}}),
+        _saved_cache(signature=None),
+        _saved_cache(version=RATES_CACHE_VERSION - 1),
+        json.dumps(
+            {
+                "data": MOCK_RATES,
+                "expires_at": (FIXED_NOW + timedelta(hours=1)).isoformat(),
+                "signature": "saved",
+            }
+        ),
+    ],
+    ids=[
+        "data-not-a-dict",
+        "data-missing-keys",
+        "data-failed-result",
+        "entries-not-a-list",
+        "signature-not-a-string",
+        "old-version",
+        "unversioned",
+    ],
+)
+def test_malformed_cache_file_is_ignored(
+    get_rates: _FakeGetRates,
+    client: FlaskClient,
+    rates_cache_path: Path,
+    saved: str,
+) -> None:
+    rates_cache_path.write_text(saved)
+
+    response = client.get("/rates")
+    assert response.status_code == 200
+    assert get_rates.call_count == 1
+    assert response.get_json()["date"] == "03/2026"
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_caches_current_month(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_cache_file_expiry_is_capped(
+    get_rates: _FakeGetRates,
+    frozen_now: FrozenClock,
+    client: FlaskClient,
+    rates_cache_path: Path,
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = MOCK_RATES
+    rates_cache_path.write_text(_saved_cache(expires_at="2099-01-01T00:00:00"))
 
     client.get("/rates")
+    assert get_rates.call_count == 0
+
+    # Treated as if fetched now: revalidated on the usual schedule.
+    frozen_now.current = FIXED_NOW + timedelta(seconds=REVALIDATE_SECONDS + 1)
     client.get("/rates")
-    assert mock_get_rates.call_count == 1
+    assert get_rates.call_count == 1
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_fallback_retries_after_interval(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_rates_revalidates_current_month_after_interval(
+    get_rates: _FakeGetRates, frozen_now: FrozenClock, client: FlaskClient
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_rates_with_warning: MeralcoRatesResult = {
+    client.get("/rates")
+    assert get_rates.call_count == 1
+
+    # Same rates, fetched later: the originally cached result is kept.
+    get_rates.return_value = {
         **MOCK_RATES,
-        "warning": "Using previous month",
+        "meta": {**MOCK_RATES["meta"], "timestamp": "2026-06-15T12:00:00"},
     }
-    mock_get_rates.return_value = mock_rates_with_warning
-
-    client.get("/rates")
-    assert mock_get_rates.call_count == 1
+    later = FIXED_NOW + timedelta(seconds=REVALIDATE_SECONDS + 1)
+    frozen_now.current = later
+    response = client.get("/rates")
+    assert get_rates.call_count == 2
+    data = response.get_json()
+    assert data["meta"]["timestamp"] == MOCK_RATES["meta"]["timestamp"]
 
-    _cache["timestamp"] = FIXED_NOW - timedelta(seconds=FALLBACK_RETRY_SECONDS + 1)
-    client.get("/rates")
-    assert mock_get_rates.call_count == 2
+    # A mid-month revision replaces the cached rates.
+    get_rates.return_value = {**MOCK_RATES, "date": "06/2026"}
+    frozen_now.current = later + timedelta(seconds=REVALIDATE_SECONDS + 1)
+    response = client.get("/rates")
+    assert get_rates.call_count == 3
+    assert response.get_json()["date"] == "06/2026"
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
 def test_rates_failure_returns_stale_cache(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+    get_rates: _FakeGetRates, frozen_now: FrozenClock, client: FlaskClient
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-
-    mock_get_rates.return_value = MOCK_RATES
     client.get("/rates")
 
-    _cache["month"] = (2026, 5)
-    mock_get_rates.return_value = {
-        "success": False,
-        "error": "Failed",
-        "warning": None,
-        "date": None,
-        "data": None,
-        "meta": {"timestamp": "2026-06-09T10:00:00", "source": None},
-    }
+    frozen_now.current = datetime(2026, 7, 1, 9, 0, 0)
+    get_rates.return_value = MOCK_FAILED_RATES
 
     response = client.get("/rates")
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data["success"] is True
     assert "warning" in data
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
 def test_rates_failure_does_not_hammer_upstream(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+    get_rates: _FakeGetRates, frozen_now: FrozenClock, client: FlaskClient
 ) -> None:
     """After a fetch failure with stale cache, subsequent requests within
     FALLBACK_RETRY_SECONDS should serve cached data without re-fetching.
     """
-    mock_datetime.now.return_value = FIXED_NOW
 
-    mock_get_rates.return_value = MOCK_RATES
     client.get("/rates")
-    assert mock_get_rates.call_count == 1
+    assert get_rates.call_count == 1
 
-    # Force the cache to look stale (different month) so the next request
-    # tries to refetch.
-    _cache["month"] = (2026, 5)
-    mock_get_rates.return_value = {
-        "success": False,
-        "error": "Failed",
-        "warning": None,
-        "date": None,
-        "data": None,
-        "meta": {"timestamp": "2026-06-09T10:00:00", "source": None},
-    }
+    # Move into the next month so the next request tries to refetch.
+    frozen_now.current = datetime(2026, 7, 1, 9, 0, 0)
+    get_rates.return_value = MOCK_FAILED_RATES
 
     client.get("/rates")
-    assert mock_get_rates.call_count == 2
+    assert get_rates.call_count == 2
 
     client.get("/rates")
     client.get("/rates")
-    assert mock_get_rates.call_count == 2
+    assert get_rates.call_count == 2
 
 
-@patch("src.api.datetime")
-@patch("src.api.get_meralco_rates")
-def test_rates_complete_failure_no_cache(
-    mock_get_rates: MagicMock, mock_datetime: MagicMock, client: FlaskClient
+def test_concurrent_requests_share_one_failed_fetch(
+    get_rates: _FakeGetRates, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    mock_datetime.now.return_value = FIXED_NOW
-    mock_get_rates.return_value = {
-        "success": False,
-        "error": "Could not find rate information",
-        "warning": None,
-        "date": None,
-        "data": None,
-        "meta": {"timestamp": "2026-06-09T10:00:00", "source": None},
-    }
-
-    response = client.get("/rates")
-    data = json.loads(response.data)
-    assert data["success"] is False
-    assert data["error"] is not None
+    """Requests queued behind a failing fetch reuse it rather than refetching."""
+    get_rates.return_value = MOCK_FAILED_RATES
+    release = threading.Event()
+
+    def slow_get_rates() -> MeralcoRatesResult:
+        release.wait(timeout=5)
+        return get_rates()
+
+    monkeypatch.setattr("src.api.get_meralco_rates", slow_get_rates)
+
+    results: list[MeralcoRatesResult] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(_fetch_and_cache()))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    # Let every thread queue on _fetch_lock before the first fetch returns.
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert get_rates.call_count == 1
+    assert results == [MOCK_FAILED_RATES] * 5
+
+    # A request arriving after the burst still retries upstream.
+    _fetch_and_cache()
+    assert get_rates.call_count == 2
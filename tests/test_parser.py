@@ -1,24 +1,31 @@
 """Tests for the MERALCO residential bills PDF parser."""
 
 import os
+import urllib.error
+from collections.abc import Callable
 from datetime import datetime
+from email.message import Message
 from pathlib import Path
+from types import ModuleType
 from unittest.mock import MagicMock, patch
 
 import pdfplumber
 import pytest
 
+import src.parser
 from src.parser import (
     ParsedRate,
     PdfRow,
     _cleanup_old_pdfs,
     _extract_billing_date,
+    _parse_single_month,
     compute_rate_changes,
     download_pdf,
     get_meralco_rates,
     get_pdf_url,
     parse_residential_bills,
 )
+from tests.helpers import FrozenClock
 
 FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
 FIXTURE_BILLS_MAR = os.path.join(FIXTURE_DIR, "03-2026_residential_bills.pdf")
@@ -200,8 +207,6 @@ class TestExtractBillingDate:
         extractor returns None and `_parse_single_month` should fall back to
         extract_text() to recover the date.
         """
-        from src.parser import _parse_single_month
-
         with open(FIXTURE_BILLS_NOV_2025, "rb") as f:
             parsed = _parse_single_month(f.read())
         assert parsed is not None
@@ -213,6 +218,30 @@ class TestExtractBillingDate:
     def test_returns_none_when_no_month_found(self) -> None:
         assert _extract_billing_date([["foo", "bar"]]) is None
 
+    def test_month_and_year_must_share_a_cell(self) -> None:
+        assert _extract_billing_date([["April", "2026"]]) is None
+        assert _extract_billing_date([["foo", None], ["April 2026"]]) == "04/2026"
+
+
+# -------------------------------------------------------------------
+# _parse_single_month
+# -------------------------------------------------------------------
+
+
+class TestParseSingleMonth:
+    def test_reuses_parse_for_identical_bytes(self) -> None:
+        _parse_single_month.cache_clear()
+        with open(FIXTURE_BILLS_MAR, "rb") as f:
+            pdf_bytes = f.read()
+
+        with patch("src.parser.pdfplumber.open", wraps=pdfplumber.open) as mock_open:
+            first = _parse_single_month(pdf_bytes)
+            second = _parse_single_month(pdf_bytes)
+
+        assert first is not None
+        assert first is second
+        assert mock_open.call_count == 1
+
 
 # -------------------------------------------------------------------
 # download_pdf (mocked)
@@ -256,6 +285,49 @@ class TestDownloadPdf:
             download_pdf("https://example.com/test.pdf")
             assert mock_urlopen.call_count == 1
 
+    def test_revalidate_sends_if_modified_since(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("src.parser.PDF_CACHE_DIR", str(tmp_path))
+        cached = tmp_path / "test.pdf"
+        cached.write_bytes(b"old-bytes")
+        os.utime(cached, (0, 0))
+        mock_response = MagicMock()
+        mock_response.read.return_value = b"new-bytes"
+        mock_response.__enter__.return_value = mock_response
+
+        with patch(
+            "src.parser.urllib.request.urlopen", return_value=mock_response
+        ) as mock_urlopen:
+            result = download_pdf("https://example.com/test.pdf", revalidate=True)
+
+        request = mock_urlopen.call_args.args[0]
+        assert request.get_header("If-modified-since") == (
+            "Thu, 01 Jan 1970 00:00:00 GMT"
+        )
+        assert result == b"new-bytes"
+        assert cached.read_bytes() == b"new-bytes"
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            urllib.error.HTTPError(
+                "https://example.com/test.pdf", 304, "Not Modified", Message(), None
+            ),
+            OSError("network error"),
+        ],
+    )
+    def test_revalidate_keeps_cached_copy(
+        self, error: Exception, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("src.parser.PDF_CACHE_DIR", str(tmp_path))
+        (tmp_path / "test.pdf").write_bytes(b"cached-bytes")
+
+        with patch("src.parser.urllib.request.urlopen", side_effect=error):
+            result = download_pdf("https://example.com/test.pdf", revalidate=True)
+
+        assert result == b"cached-bytes"
+
 
 # -------------------------------------------------------------------
 # _cleanup_old_pdfs
@@ -290,6 +362,15 @@ class TestCleanupOldPdfs:
 # -------------------------------------------------------------------
 
 
+@pytest.fixture
+def parser_now(
+    freeze_clock: Callable[[ModuleType, datetime], FrozenClock],
+) -> FrozenClock:
+    """Freeze src.parser's clock at 2026-03-15; tests may move `.current`."""
+    return freeze_clock(src.parser, datetime(2026, 3, 15))
+
+
+@pytest.mark.usefixtures("parser_now")
 class TestGetMeralcoRates:
     @patch("src.parser.download_pdf")
     def test_success_with_real_pdfs(self, mock_download: MagicMock) -> None:
@@ -298,7 +379,7 @@ class TestGetMeralcoRates:
         with open(FIXTURE_BILLS_FEB, "rb") as f:
             feb_bytes = f.read()
 
-        def side_effect(url: str) -> bytes | None:
+        def side_effect(url: str, revalidate: bool = False) -> bytes | None:
             if "03-2026" in url:
                 return mar_bytes
             if "02-2026" in url:
@@ -307,10 +388,7 @@ class TestGetMeralcoRates:
 
         mock_download.side_effect = side_effect
 
-        with patch("src.parser.datetime") as mock_datetime:
-            mock_datetime.now.return_value = datetime(2026, 3, 15)
-            mock_datetime.strptime = datetime.strptime
-            result = get_meralco_rates()
+        result = get_meralco_rates()
 
         assert result["success"] is True
         assert result["date"] == "03/2026"
@@ -322,21 +400,42 @@ class TestGetMeralcoRates:
         assert entry_200["rate_change"] == round(13.8161 - 13.1734, 4)
         assert entry_200["trend"] == "up"
 
+        # Only the current month is revalidated; the diff base comes from disk.
+        # The two months download concurrently, so compare order-free.
+        assert sorted(c.args for c in mock_download.call_args_list) == [
+            (get_pdf_url(datetime(2026, 2, 1)), False),
+            (get_pdf_url(datetime(2026, 3, 1)), True),
+        ]
+
     @patch("src.parser.download_pdf")
-    def test_current_month_fails_falls_back(self, mock_download: MagicMock) -> None:
-        call_count = [0]
+    def test_current_month_fails_falls_back(
+        self, mock_download: MagicMock, parser_now: FrozenClock
+    ) -> None:
+        with open(FIXTURE_BILLS_MAR, "rb") as f:
+            mar_bytes = f.read()
 
-        def side_effect(url: str) -> bytes | None:
-            call_count[0] += 1
-            if call_count[0] <= 1:
+        def side_effect(url: str, revalidate: bool = False) -> bytes | None:
+            # April isn't published yet; March and February (the diff base)
+            # both resolve.
+            if "04-2026" in url:
                 return None
-            with open(FIXTURE_BILLS_MAR, "rb") as f:
-                return f.read()
+            return mar_bytes
 
         mock_download.side_effect = side_effect
+        parser_now.current = datetime(2026, 4, 5)
+
         result = get_meralco_rates()
+
         assert result["success"] is True
         assert result["warning"] is not None
+        assert result["meta"]["source"] == get_pdf_url(datetime(2026, 3, 1))
+        # Only the unpublished current month is revalidated; March (now
+        # served) and February (its diff base) come from disk.
+        assert sorted(c.args for c in mock_download.call_args_list) == [
+            (get_pdf_url(datetime(2026, 2, 1)), False),
+            (get_pdf_url(datetime(2026, 3, 1)), False),
+            (get_pdf_url(datetime(2026, 4, 1)), True),
+        ]
 
     @patch("src.parser.download_pdf")
     def test_both_months_fail(self, mock_download: MagicMock) -> None: